@@ -21,6 +21,12 @@ def create_app(config_name=None):
     db.init_app(app)
     migrate = Migrate(app, db)
     CORS(app)
+    from app.loaders import TaskLoader
+    app.extensions['task_loader'] = TaskLoader(  # Bộ gộp truy vấn lấy task theo ID (mỗi app 1 bộ)
+        window_ms=app.config['TASK_LOADER_WINDOW_MS'],
+        max_batch=app.config['BATCH_GET_MAX_IDS'],
+        wait_timeout=app.config['TASK_LOADER_WAIT_TIMEOUT'],
+    )
     # Đăng ký route cho app (chia theo blueprint)
     from app.main import bp as main_bp
     app.register_blueprint(main_bp)
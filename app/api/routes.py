@@ -3,20 +3,56 @@ API endpoint cho các thao tác CRUD và tìm kiếm Task (Todo).
 Các hàm đều trả về JSON rõ ràng, dễ thuyết trình.
 """
 import csv, json, os
-from flask import request, jsonify, send_file
+from flask import request, jsonify, send_file, current_app
 from app.api import bp  # Blueprint cho nhóm route API
 from app.models import TaskManager
 from datetime import datetime
 
-# Lấy danh sách task (có filter completed tuỳ chọn)
+TASK_ID_MIN, TASK_ID_MAX = -2**31, 2**31 - 1  # Phạm vi cột Integer của Task.id
+
+# Kiểm tra danh sách ID (list int thật, không nhận bool/float) -> list không trùng, giữ thứ tự
+def _parse_ids(raw):
+    if not isinstance(raw, list) or not raw or not all(isinstance(i, int) and not isinstance(i, bool) for i in raw):
+        raise ValueError('ids must be a non-empty list of integers')
+    if any(i < TASK_ID_MIN or i > TASK_ID_MAX for i in raw):
+        raise ValueError('ids out of range')
+    ids = list(dict.fromkeys(raw))
+    max_ids = current_app.config.get('BATCH_GET_MAX_IDS', 100)
+    if len(ids) > max_ids:
+        raise ValueError(f'Too many ids (max {max_ids})')
+    return ids
+
+# Chuyển chuỗi query string "1,2,3" -> list int (chỉ dùng cho ?ids=)
+def _parse_ids_arg(raw):
+    try:
+        return [int(part) for part in raw.split(',') if part.strip()]
+    except ValueError:
+        raise ValueError('ids must be a non-empty list of integers')
+
+# Lấy nhiều task theo ID bằng 1 câu truy vấn, trả về đúng thứ tự ID yêu cầu
+def _batch_get_response(ids):
+    ids = _parse_ids(ids)
+    found = TaskManager.get_tasks_by_ids(ids)
+    if found is None:
+        return jsonify({'success': False, 'error': 'Could not load tasks'}), 500
+    tasks = [found[i] for i in ids if i in found]
+    missing = [i for i in ids if i not in found]
+    return jsonify({'success': True, 'data': tasks, 'count': len(tasks), 'missing': missing}), 200
+
+# Lấy danh sách task (có filter completed tuỳ chọn, hoặc ?ids=1,2,3 để lấy theo ID)
 @bp.route('/tasks', methods=['GET'])
 def get_tasks():
     try:
+        ids = request.args.get('ids')
+        if ids is not None:
+            return _batch_get_response(_parse_ids_arg(ids))
         completed = request.args.get('completed')
         if completed is not None:
             completed = completed.lower() == 'true'  # Chuẩn hoá bool
         tasks = TaskManager.get_all_tasks(completed=completed)
         return jsonify({'success': True, 'data': tasks, 'count': len(tasks)}), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -24,13 +60,26 @@ def get_tasks():
 @bp.route('/tasks/<int:task_id>', methods=['GET'])
 def get_task(task_id):
     try:
-        task = TaskManager.get_task_by_id(task_id)
+        task = current_app.extensions['task_loader'].load(task_id)  # Gộp với các lookup đồng thời khác
         if task:
             return jsonify({'success': True, 'data': task}), 200
         return jsonify({'success': False, 'error': 'Task not found'}), 404
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Lấy nhiều task theo danh sách ID trong body JSON: {"ids": [1, 2, 3]}
+@bp.route('/tasks/batch-get', methods=['POST'])
+def batch_get_tasks():
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or 'ids' not in data:
+            return jsonify({'success': False, 'error': 'ids is required'}), 400
+        return _batch_get_response(data['ids'])
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 # Thêm task mới
 @bp.route('/tasks', methods=['POST'])
 def create_task():
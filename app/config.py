@@ -12,6 +12,9 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URI', 'sqlite:///todo.db')   # Đường dẫn DB mặc định sqlite (dễ deploy demo)
     SQLALCHEMY_TRACK_MODIFICATIONS = False  # Không theo dõi object, tiết kiệm tài nguyên
     JSON_AS_ASCII = False                   # Hỗ trợ hiển thị Unicode
+    BATCH_GET_MAX_IDS = int(os.getenv('BATCH_GET_MAX_IDS', '100'))                  # Số ID tối đa cho 1 lần lấy nhiều task
+    TASK_LOADER_WINDOW_MS = float(os.getenv('TASK_LOADER_WINDOW_MS', '0'))          # Cửa sổ gộp lookup đơn lẻ (mặc định tắt, bật khi có fan-out)
+    TASK_LOADER_WAIT_TIMEOUT = float(os.getenv('TASK_LOADER_WAIT_TIMEOUT', '1'))    # Số giây tối đa chờ lô gộp trước khi tự truy vấn riêng
 
 class DevelopmentConfig(Config):
     DEBUG = True
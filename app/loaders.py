@@ -0,0 +1,66 @@
+"""
+Bộ gộp truy vấn (kiểu DataLoader) cho việc lấy task theo ID.
+Các request GET /api/tasks/<id> đến gần như cùng lúc (trong vài ms) sẽ được
+gộp lại thành 1 câu SELECT ... IN (...) thay vì mỗi request 1 câu SELECT.
+"""
+import threading
+import time
+from app.models import TaskManager
+
+
+class _Batch:
+    """Một lô ID đang chờ được truy vấn chung."""
+    def __init__(self):
+        self.ids = set()
+        self.results = None  # None = leader chưa truy vấn được (lỗi/bị ngắt)
+        self.done = threading.Event()
+
+
+class TaskLoader:
+    """
+    Gộp các lookup đơn lẻ theo ID trong cùng cửa sổ thời gian.
+    Request đầu tiên mở lô (leader), chờ window_ms rồi truy vấn cho cả lô;
+    các request đến sau chỉ thêm ID vào lô và chờ kết quả.
+    Mỗi app Flask có 1 loader riêng (lưu trong app.extensions['task_loader']).
+    """
+    def __init__(self, window_ms=0, max_batch=100, wait_timeout=1.0):
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self.wait_timeout = wait_timeout  # Số giây tối đa follower chờ leader
+        self._lock = threading.Lock()
+        self._batch = None
+
+    def _close(self, batch):
+        """Đóng lô để request mới mở lô khác (an toàn khi gọi nhiều lần)."""
+        with self._lock:
+            if self._batch is batch:
+                self._batch = None
+
+    def load(self, task_id):
+        """
+        Lấy 1 task theo ID (trả về dict hoặc None), có gộp truy vấn.
+        """
+        if not self.window_ms or self.window_ms <= 0:
+            return TaskManager.get_task_by_id(task_id)
+        with self._lock:
+            batch = self._batch
+            is_leader = batch is None or len(batch.ids) >= self.max_batch
+            if is_leader:
+                batch = _Batch()
+                self._batch = batch
+            batch.ids.add(task_id)
+        if not is_leader:
+            # Leader lỗi hoặc quá lâu -> tự truy vấn riêng, không treo request
+            if not batch.done.wait(self.wait_timeout) or batch.results is None:
+                return TaskManager.get_task_by_id(task_id)
+            return batch.results.get(task_id)
+        try:
+            time.sleep(self.window_ms / 1000.0)  # Chờ các request khác nhập lô
+            self._close(batch)
+            batch.results = TaskManager.get_tasks_by_ids(batch.ids)  # None nếu truy vấn lỗi
+        finally:
+            self._close(batch)
+            batch.done.set()  # Luôn đánh thức các request đang chờ
+        if batch.results is None:
+            return TaskManager.get_task_by_id(task_id)  # Lô lỗi -> leader cũng tự truy vấn riêng
+        return batch.results.get(task_id)
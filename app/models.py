@@ -88,6 +88,23 @@ class TaskManager:
             print(f"Error getting task: {str(e)}")
             return None
 
+    @staticmethod
+    def get_tasks_by_ids(task_ids):
+        """
+        Lấy nhiều task theo danh sách ID chỉ bằng 1 câu SELECT ... IN (...).
+        Trả về dict {id: task_dict}, ID không tồn tại sẽ không có trong dict.
+        Trả về None nếu truy vấn lỗi (khác với {} = không có ID nào tồn tại).
+        """
+        if not task_ids:
+            return {}
+        try:
+            tasks = Task.query.filter(Task.id.in_(set(task_ids))).all()
+            return {task.id: task.to_dict() for task in tasks}
+        except Exception as e:
+            db.session.rollback()  # Dọn transaction lỗi để truy vấn sau vẫn chạy được
+            print(f"Error getting tasks by ids: {str(e)}")
+            return None
+
     @staticmethod
     def update_task(task_id, **kwargs):
         """
@@ -28,6 +28,8 @@ if __name__ == '__main__':
     print("  API Endpoints:")
     print("    - GET    /api/tasks")
     print("    - POST   /api/tasks")
+    print("    - GET    /api/tasks?ids=1,2,3")
+    print("    - POST   /api/tasks/batch-get")
     print("    - GET    /api/tasks/<id>")
     print("    - PUT    /api/tasks/<id>")
     print("    - DELETE /api/tasks/<id>")
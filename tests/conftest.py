@@ -0,0 +1,20 @@
+"""
+Fixture dùng chung cho pytest (pytest-flask cần fixture `app`).
+Mỗi test chạy trên 1 file SQLite tạm riêng.
+"""
+import pytest
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Engine được tạo lúc create_app nên phải đổi DB trước khi gọi
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
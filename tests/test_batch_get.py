@@ -0,0 +1,254 @@
+"""
+Test cho API lấy nhiều task theo ID và bộ gộp truy vấn TaskLoader.
+"""
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import event, text
+from app import loaders
+from app.extensions import db
+from app.loaders import TaskLoader
+from app.models import TaskManager
+
+TOO_LARGE_ID = 10**30  # SQLite báo lỗi "int too large" khi truy vấn ID này
+
+
+def _create_tasks(n):
+    return [TaskManager.create_task(f'Task {i}')['id'] for i in range(n)]
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+@pytest.fixture
+def query_counter(app):
+    counter = {'n': 0}
+    def on_execute(*args):
+        counter['n'] += 1
+    event.listen(db.engine, 'before_cursor_execute', on_execute)
+    yield counter
+    event.remove(db.engine, 'before_cursor_execute', on_execute)
+
+
+@pytest.fixture
+def held_window(monkeypatch):
+    """
+    Giữ cửa sổ gộp của leader mở cho tới khi test gọi release.set(),
+    để follower chắc chắn nhập lô mà không phụ thuộc thời gian.
+    """
+    in_window = threading.Event()
+    release = threading.Event()
+    def fake_sleep(seconds):
+        in_window.set()
+        release.wait(5)
+    monkeypatch.setattr(loaders, 'time', SimpleNamespace(sleep=fake_sleep))
+    return SimpleNamespace(in_window=in_window, release=release)
+
+
+@pytest.fixture
+def batch_calls(monkeypatch):
+    """Ghi lại các lô ID được truy vấn (vẫn gọi hàm thật)."""
+    calls = []
+    real_get_tasks_by_ids = TaskManager.get_tasks_by_ids
+    def recording(task_ids):
+        calls.append(set(task_ids))
+        return real_get_tasks_by_ids(task_ids)
+    monkeypatch.setattr(TaskManager, 'get_tasks_by_ids', staticmethod(recording))
+    return calls
+
+
+def _start_loader_thread(app, loader, task_id, results):
+    def run():
+        with app.app_context():
+            results[task_id] = loader.load(task_id)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def _start_follower(app, loader, task_id, results):
+    """Chạy follower và chờ (có deadline) tới khi nó đã nhập lô đang mở."""
+    batch = loader._batch
+    assert batch is not None
+    size = len(batch.ids)
+    thread = _start_loader_thread(app, loader, task_id, results)
+    assert _wait_until(lambda: len(batch.ids) > size), 'follower did not join the batch'
+    return thread
+
+
+def test_get_by_ids_keeps_order_and_lists_missing(client):
+    a, b, c = _create_tasks(3)
+    resp = client.get(f'/api/tasks?ids={c},{a},999')
+    body = resp.get_json()
+    assert resp.status_code == 200
+    assert [t['id'] for t in body['data']] == [c, a]
+    assert body['missing'] == [999]
+    assert body['count'] == 2
+
+
+def test_batch_get_keeps_order_and_lists_missing(client):
+    a, b, c = _create_tasks(3)
+    resp = client.post('/api/tasks/batch-get', json={'ids': [b, 999, c]})
+    body = resp.get_json()
+    assert resp.status_code == 200
+    assert [t['id'] for t in body['data']] == [b, c]
+    assert body['missing'] == [999]
+
+
+def test_batch_get_uses_one_query(client, query_counter):
+    ids = _create_tasks(5)
+    query_counter['n'] = 0
+    resp = client.post('/api/tasks/batch-get', json={'ids': ids})
+    assert resp.get_json()['count'] == 5
+    assert query_counter['n'] == 1
+
+
+def test_duplicate_ids_are_returned_once(client):
+    a, b = _create_tasks(2)
+    body = client.post('/api/tasks/batch-get', json={'ids': [a, b, a, a]}).get_json()
+    assert [t['id'] for t in body['data']] == [a, b]
+    body = client.get(f'/api/tasks?ids={b},{b},{a}').get_json()
+    assert [t['id'] for t in body['data']] == [b, a]
+
+
+def test_max_ids_limit(app, client):
+    app.config['BATCH_GET_MAX_IDS'] = 3
+    assert client.post('/api/tasks/batch-get', json={'ids': [1, 2, 3]}).status_code == 200
+    resp = client.post('/api/tasks/batch-get', json={'ids': [1, 2, 3, 4]})
+    assert resp.status_code == 400
+    assert 'max 3' in resp.get_json()['error']
+    # Trùng lặp không tính vào giới hạn
+    assert client.post('/api/tasks/batch-get', json={'ids': [1, 1, 2, 2, 3]}).status_code == 200
+    assert client.get('/api/tasks?ids=1,2,3,4').status_code == 400
+
+
+def test_batch_get_rejects_bad_input(client):
+    bad_bodies = [
+        {},
+        {'ids': []},
+        {'ids': '1,2'},
+        {'ids': [2, True]},
+        {'ids': [1.9]},
+        {'ids': ['1']},
+        {'ids': [None]},
+        {'ids': [1, TOO_LARGE_ID]},
+        {'ids': [2**31]},
+        'ids',
+        [1, 2],
+    ]
+    for body in bad_bodies:
+        resp = client.post('/api/tasks/batch-get', json=body)
+        assert resp.status_code == 400, body
+        assert resp.get_json()['success'] is False
+    resp = client.post('/api/tasks/batch-get', data='not json', content_type='application/json')
+    assert resp.status_code == 400
+
+
+def test_get_by_ids_rejects_bad_query_string(client):
+    for raw in ['', ',', 'a,b', '1.5', f'1,{TOO_LARGE_ID}']:
+        assert client.get(f'/api/tasks?ids={raw}').status_code == 400, raw
+
+
+def test_loader_disabled_by_default(app, client):
+    assert app.extensions['task_loader'].window_ms == 0
+    (a,) = _create_tasks(1)
+    assert client.get(f'/api/tasks/{a}').get_json()['data']['id'] == a
+    assert client.get('/api/tasks/999').status_code == 404
+
+
+def test_batch_get_returns_500_when_query_fails(client):
+    (a,) = _create_tasks(1)
+    db.session.execute(text('ALTER TABLE tasks RENAME TO tasks_gone'))
+    db.session.commit()
+    resp = client.post('/api/tasks/batch-get', json={'ids': [a]})
+    assert resp.status_code == 500
+    assert resp.get_json()['success'] is False
+    assert client.get(f'/api/tasks?ids={a}').status_code == 500
+    db.session.execute(text('ALTER TABLE tasks_gone RENAME TO tasks'))
+    db.session.commit()
+
+
+def test_loader_coalesces_concurrent_lookups(app, query_counter):
+    ids = _create_tasks(5)
+    wanted = ids + [999]
+    loader = TaskLoader(window_ms=200, wait_timeout=5)
+    query_counter['n'] = 0
+    results = {}
+    threads = [_start_loader_thread(app, loader, i, results) for i in wanted]
+    for t in threads:
+        t.join(5)
+        assert not t.is_alive()
+    assert query_counter['n'] == 1
+    for task_id in ids:
+        assert results[task_id]['id'] == task_id
+    assert results[999] is None
+
+
+def test_loader_follower_joins_leader_batch(app, held_window, batch_calls):
+    a, b = _create_tasks(2)
+    loader = TaskLoader(window_ms=100, wait_timeout=5)
+    results = {}
+    leader = _start_loader_thread(app, loader, a, results)
+    assert held_window.in_window.wait(5)
+    follower = _start_follower(app, loader, b, results)
+    held_window.release.set()
+    for t in (leader, follower):
+        t.join(5)
+        assert not t.is_alive()
+    assert batch_calls == [{a, b}]  # 1 truy vấn chung cho cả 2
+    assert results[a]['id'] == a
+    assert results[b]['id'] == b
+
+
+def test_loader_falls_back_when_batch_query_fails(app, held_window, batch_calls):
+    (a,) = _create_tasks(1)
+    loader = TaskLoader(window_ms=100, wait_timeout=5)
+    results = {}
+    # ID quá lớn làm cả câu IN (...) lỗi thật trên SQLite
+    leader = _start_loader_thread(app, loader, TOO_LARGE_ID, results)
+    assert held_window.in_window.wait(5)
+    follower = _start_follower(app, loader, a, results)
+    held_window.release.set()
+    for t in (leader, follower):
+        t.join(5)
+        assert not t.is_alive()
+    assert batch_calls == [{TOO_LARGE_ID, a}]
+    assert results[TOO_LARGE_ID] is None
+    assert results[a]['id'] == a  # Không bị 404 giả vì lô lỗi
+    assert loader._batch is None  # Lô lỗi đã được đóng, request sau không bị kẹt
+
+
+def test_loader_follower_times_out_instead_of_hanging(app, held_window, batch_calls):
+    a, b = _create_tasks(2)
+    loader = TaskLoader(window_ms=100, wait_timeout=0.05)
+    results = {}
+    leader = _start_loader_thread(app, loader, a, results)
+    assert held_window.in_window.wait(5)
+    follower = _start_follower(app, loader, b, results)
+    follower.join(5)  # Leader vẫn bị giữ -> follower phải tự truy vấn sau timeout
+    assert not follower.is_alive()
+    assert results[b]['id'] == b
+    assert batch_calls == []
+    held_window.release.set()
+    leader.join(5)
+    assert not leader.is_alive()
+    assert results[a]['id'] == a
+
+
+def test_loader_settings_come_from_config(app):
+    loader = app.extensions['task_loader']
+    assert loader.wait_timeout == app.config['TASK_LOADER_WAIT_TIMEOUT']
+    assert loader.max_batch == app.config['BATCH_GET_MAX_IDS']
+
+
+def test_loaders_are_per_app(app):
+    from app import create_app
+    other = create_app('testing')
+    assert other.extensions['task_loader'] is not app.extensions['task_loader']